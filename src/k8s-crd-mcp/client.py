@@ -1,232 +1,63 @@
-from dis import Instruction
 from fastmcp import Client
 from mcp.types import Tool
-from openai import OpenAI, RateLimitError
+from openai import AsyncOpenAI, RateLimitError, APIConnectionError, APITimeoutError, InternalServerError
 import os
 import logging
 import asyncio
-import json
-import time
+import random
+import re
 import httpx
+import orjson
+from prompt_toolkit import PromptSession
+from prompt_toolkit.patch_stdout import patch_stdout
+from pathlib import Path
 
 
-instructions = """
-You are an expert OpenShift ZTP (Zero Touch Provisioning) assistant. Your primary goal is to guide users step-by-step through the installation and provisioning of OpenShift clusters using ZTP technology, specifically leveraging the Assisted Service Hive integration.
-
-
-When a user interacts with you, they will provide a list of available tools. Your task is to clearly identify which tool is needed for each stage of the ZTP provisioning process and instruct the user on its proper application. Your responses should be unambiguous, actionable, and directly correspond to the steps detailed in your reference guide.
-
-*** IMPORTANT ***
-
-**Crucial Directive:** Your primary goal is to provide accurate and helpful information. **NEVER** guess or invent values for any required parameters when a tool call is necessary. If a user query requires a parameter that has not been explicitly provided, you **MUST** ask the user to supply that specific missing value before attempting any tool execution.
-**Critical Directive:** YOU **MUST** use required parameters. If you don't the call will fail. Try to use only required parameters, and add optionals only if necessary.
----
-
-**Tool Call Format:**
-When a tool is required to answer the user's query, reply with `<tool_call>` followed by a one-item JSON list containing the tool.
-
-**Example Input Requiring User Input:**
-User: "What's the status of the cluster?" (Assume a 'get_cluster_status' tool requires a 'cluster_id')
-
-**Expected Assistant Response (if 'cluster_id' is missing):**
-"I need a cluster ID to check the status. Could you please provide the cluster ID?"
-
-**Example Input with Complete Information:**
-User: "Read the content of the file in this path: /path/to/file"
-
-**Expected Assistant Response (Tool Call):**
-<tool_call>[{"name": "read_file", "arguments": {"path": "/path/to/file"}}]</tool_call>
-
-
-NOTE: When using tools, do your best to avoid using non-required arguments. Limit your verbosity when calling the tools and send over only required parameters, and use optional one only if necessary.
-
----
-
-Optional parameters might be necessary for specific setups or if requested by the user.
-Also make sure you do not make up any values, and ask the user if unsure.
-
-*** Zero Touch Provisioning (ZTP) provisioning flow ****
-
-Requirements: the user should create a namespace and create a pullsecret secret in it:
-
-oc create ns mynamespace
-oc create secret generic mycluster-pull-secret --from-file=.dockerconfigjson=/path/to/pull-secret --type=kubernetes.io/dockerconfigjson --namespace mynamespace
-
-We MUST create the following resources:
-- ClusterImageSet
-- ClusterDeployment (make sure we reference the correct AgentClusterInstall)
-- AgentClusterInstall (make sure we reference the correct ClusterDeployment and AgentClusterInstall)
-- InfraEnv
-
-After this is created correctly, we'll eventually see the ISO url in the InfraEnv resource status.
-We need to provide this ISO url to the user.
-
-After the user has booted the hosts with the ISO url, we need to approve the Agents.
-We need to update the Agent .spec.approved field to true.
-
-----
-
-Example manifests that should be created for Multinode:
-
----
-apiVersion: hive.openshift.io/v1
-kind: ClusterImageSet
-metadata:
-  creationTimestamp: "2025-06-25T10:37:03Z"
-  generation: 1
-  name: test-multinode
-  resourceVersion: "4432"
-  uid: ce582bf1-a3d3-4d26-929f-1d945ec8ab38
-spec:
-  releaseImage: quay.io/openshift-release-dev/ocp-release:4.19.0-ec.2-x86_64
----
-apiVersion: hive.openshift.io/v1
-kind: ClusterDeployment
-metadata:
-  name: test-multinode
-  namespace: spoke-cluster
-spec:
-  baseDomain: lab.home
-  clusterInstallRef:
-    group: extensions.hive.openshift.io
-    kind: AgentClusterInstall
-    name: test-multinode
-    version: v1beta1
-  clusterName: test-multinode
-  controlPlaneConfig:
-    servingCertificates: {}
-  installed: false
-  platform:
-    agentBareMetal:
-      agentSelector: {}
-  pullSecretRef:
-    name: pull-secret
----
-apiVersion: extensions.hive.openshift.io/v1beta1
-kind: AgentClusterInstall
-metadata:
-  name: test-multinode
-  namespace: spoke-cluster
-spec:
-  apiVIPs:
-  - 192.168.222.40
-  clusterDeploymentRef:
-    name: test-multinode
-  imageSetRef:
-    name: test-multinode
-  ingressVIPs:
-  - 192.168.222.41
-  networking:
-    clusterNetwork:
-    - cidr: 172.18.0.0/20
-      hostPrefix: 23
-    serviceNetwork:
-    - 10.96.0.0/12
-    userManagedNetworking: false
-  platformType: BareMetal
-  provisionRequirements:
-    controlPlaneAgents: 3
-    workerAgents: 2
----
-apiVersion: agent-install.openshift.io/v1beta1
-kind: InfraEnv
-metadata: 
-  name: test-multinode
-  namespace: spoke-cluster
-spec:
-  clusterRef:
-    name: test-multinode
-    namespace: spoke-cluster
-  cpuArchitecture: x86_64
-  imageType: full-iso
-  ipxeScriptType: ""
-  nmStateConfigLabelSelector: {}
-  pullSecretRef:
-    name: pull-secret
-
-
-Example manifests that should be created for Single Node Openshift (SNO):
-
----
-apiVersion: hive.openshift.io/v1
-kind: ClusterImageSet
-metadata:
-  creationTimestamp: "2025-06-25T10:37:03Z"
-  generation: 1
-  name: test-multinode
-  resourceVersion: "4432"
-  uid: ce582bf1-a3d3-4d26-929f-1d945ec8ab38
-spec:
-  releaseImage: quay.io/openshift-release-dev/ocp-release:4.19.0-ec.2-x86_64
----
-apiVersion: hive.openshift.io/v1
-kind: ClusterDeployment
-metadata:
-  name: test-multinode
-  namespace: spoke-cluster
-spec:
-  baseDomain: lab.home
-  clusterInstallRef:
-    group: extensions.hive.openshift.io
-    kind: AgentClusterInstall
-    name: test-multinode
-    version: v1beta1
-  clusterName: test-multinode
-  controlPlaneConfig:
-    servingCertificates: {}
-  installed: false
-  platform:
-    agentBareMetal:
-      agentSelector: {}
-  pullSecretRef:
-    name: pull-secret
----
-apiVersion: extensions.hive.openshift.io/v1beta1
-kind: AgentClusterInstall
-metadata:
-  name: test-multinode
-  namespace: spoke-cluster
-spec:
-  clusterDeploymentRef:
-    name: test-multinode
-  imageSetRef:
-    name: test-multinode
-  networking:
-    clusterNetwork:
-    - cidr: 172.18.0.0/20
-      hostPrefix: 23
-    serviceNetwork:
-    - 10.96.0.0/12
-    userManagedNetworking: true
-  platformType: None
-  provisionRequirements:
-    controlPlaneAgents: 1
----
-apiVersion: agent-install.openshift.io/v1beta1
-kind: InfraEnv
-metadata: 
-  name: test-multinode
-  namespace: spoke-cluster
-spec:
-  clusterRef:
-    name: test-multinode
-    namespace: spoke-cluster
-  cpuArchitecture: x86_64
-  imageType: full-iso
-  ipxeScriptType: ""
-  nmStateConfigLabelSelector: {}
-  pullSecretRef:
-    name: pull-secret
-
----
-
-FULL DOCUMENTATION:
-https://github.com/openshift/assisted-service/blob/master/docs/hive-integration/README.md
-"""
+# Static system prompt, sent first so the provider can cache it as a common prefix
+SYSTEM_PROMPT_PATH = Path(__file__).parent / "prompts" / "ztp_system.md"
 
 model = os.getenv("OPENAI_MODEL", "ibm-granite/granite-3.2-8b-instruct")
 #"gpt-4.1",
 
+# Errors worth retrying: throttling, transient network failures and server errors
+RETRYABLE_ERRORS = (RateLimitError, APIConnectionError, APITimeoutError, InternalServerError)
+RETRY_BASE_DELAY = 0.5
+RETRY_MAX_DELAY = 60
+
+# Transcript bounds: older messages are folded into a running summary
+MAX_HISTORY_MESSAGES = int(os.getenv("MAX_HISTORY_MESSAGES", "20"))
+MAX_HISTORY_TOKENS = int(os.getenv("MAX_HISTORY_TOKENS", "24000"))
+summary_model = os.getenv("OPENAI_SUMMARY_MODEL", model)
+SUMMARY_PROMPT = "Summarize the following conversation between a user and an OpenShift ZTP assistant. Keep every resource name, namespace, parameter value and decision, and what is left to do. Be concise."
+
+# Maximum number of tool calls in flight, bounds the load put on the API server
+MAX_CONCURRENT_TOOL_CALLS = int(os.getenv("MAX_CONCURRENT_TOOL_CALLS", "8"))
+tool_call_semaphore = asyncio.Semaphore(MAX_CONCURRENT_TOOL_CALLS)
+
+# Maximum number of server tools sent to the model on each turn
+TOOL_SELECTION_TOP_K = int(os.getenv("TOOL_SELECTION_TOP_K", "20"))
+# Tool name segments that describe the operation rather than the resource
+ACTION_KEYWORDS = {"get", "list", "create", "update", "documentation"}
+
+DISCOVERY_TOOL_NAME = "list_available_tools"
+DISCOVERY_TOOL = {
+    "type": "function",
+    "function": {
+        "name": DISCOVERY_TOOL_NAME,
+        "description": "Search the available Kubernetes resource tools by keyword (for example a resource kind such as 'infraenv'). Matching tools become available for the next calls.",
+        "parameters": {
+            "type": "object",
+            "properties": {
+                "keyword": {
+                    "type": "string",
+                    "description": "Keyword to search for in tool names and descriptions"
+                }
+            },
+            "required": ["keyword"]
+        },
+    }
+}
+
 
 logging.basicConfig(level=logging.INFO)
 logging.info("Starting OPENAI client")
@@ -241,57 +72,293 @@ def tool_to_dict(tool: Tool) -> dict:
         }
     }
 
-def call_openai_api(openai_client, messages, tools, retries=3):
+class ToolCatalog:
+    """
+    Index of the tools exposed by the MCP server, used to send the model only
+    the tools relevant to the current turn instead of the whole catalog.
+    """
+
+    def __init__(self, openai_tools: list):
+        self.tools_by_name = {tool["function"]["name"]: tool for tool in openai_tools}
+        self.names_by_keyword = {}
+        for name in self.tools_by_name:
+            for keyword in name.split("_"):
+                self.names_by_keyword.setdefault(keyword, set()).add(name)
+        self.active = []
+
+    def select(self, text: str, top_k: int = TOOL_SELECTION_TOP_K) -> list:
+        """
+        Select the tools matching the resource kinds mentioned in text.
+        Keeps the previous selection when nothing matches (e.g. "yes, go ahead").
+
+        Returns:
+            list: The tools to send to the model, always including the discovery tool.
+        """
+        words = set(re.findall(r"[a-z0-9]+", text.lower()))
+        words |= {word[:-1] for word in words if word.endswith("s")}
+        compact = "".join(re.findall(r"[a-z0-9]+", text.lower()))
+
+        scores = {}
+        for keyword, names in self.names_by_keyword.items():
+            if keyword in ACTION_KEYWORDS or not (keyword in words or (len(keyword) > 4 and keyword in compact)):
+                continue
+            for name in names:
+                scores[name] = scores.get(name, 0) + 2
+        for keyword in ACTION_KEYWORDS & words:
+            for name in self.names_by_keyword.get(keyword, ()):
+                if name in scores:
+                    scores[name] += 1
+
+        if scores:
+            ranked = sorted(scores, key=lambda name: (-scores[name], name))[:top_k]
+            self.active = [self.tools_by_name[name] for name in ranked]
+        logging.info("Selected %s of %s tools", len(self.active), len(self.tools_by_name))
+        return [DISCOVERY_TOOL] + self.active
+
+    def search(self, keyword: str, tools: list) -> str:
+        """
+        Handle the discovery tool: add the tools matching keyword to tools.
+
+        Returns:
+            str: JSON list of the matching tool names and descriptions.
+        """
+        keyword = keyword.lower()
+        matches = [
+            tool for name, tool in self.tools_by_name.items()
+            if keyword in name or keyword in (tool["function"]["description"] or "").lower()
+        ]
+        for tool in matches:
+            if tool not in tools:
+                tools.append(tool)
+        return orjson.dumps([
+            {"name": tool["function"]["name"], "description": tool["function"]["description"]}
+            for tool in matches
+        ]).decode()
+
+async def call_openai_api(openai_client, messages, tools, max_retries=5):
+    """
+    Start a streamed chat completion, retrying transient failures with
+    exponential backoff and jitter.
+
+    Args:
+        openai_client: AsyncOpenAI client instance
+        messages: Conversation messages to send
+        tools: Tools to expose to the model
+        max_retries: Maximum number of retries after the first attempt
+
+    Returns:
+        The completion stream, or None if all attempts failed
+    """
+    create_completion = openai_client.chat.completions.create
+    for attempt in range(max_retries + 1):
+        try:
+            logging.info("Calling OpenAI API with model %s (attempt: %d)", model, attempt + 1)
+            return await create_completion(
+                model=model,
+                messages=messages,
+                tools=tools,
+                max_tokens=32000,
+                temperature=0.1,
+                stream=True,
+                stream_options={"include_usage": True},
+            )
+        except RETRYABLE_ERRORS as e:
+            logging.error("Transient OpenAI API error: %s", e)
+        except Exception as e:
+            logging.error("Unexpected error occurred: %s", e)
+            return None
+
+        if attempt < max_retries:
+            delay = min(RETRY_MAX_DELAY, RETRY_BASE_DELAY * 2 ** attempt)
+            delay += random.uniform(0, delay / 2)
+            logging.info("Retrying in %.1f seconds...", delay)
+            await asyncio.sleep(delay)
+    return None
+
+
+def message_field(message, name: str):
+    # Messages are either dicts or ChatCompletionMessage objects returned by the API
+    if isinstance(message, dict):
+        return message.get(name)
+    return getattr(message, name, None)
+
+def message_text(message) -> str:
+    content = message_field(message, "content")
+    return content if isinstance(content, str) else str(content or "")
+
+def estimate_tokens(messages: list) -> int:
+    # ~4 characters per token is close enough to decide when to compact
+    return sum(len(message_text(message)) for message in messages) // 4
+
+async def summarize(openai_client, messages: list):
+    """
+    Summarize messages with the summary model.
+
+    Returns:
+        The summary, or None if the call failed
+    """
+    transcript = "\n".join(f"{message_field(m, 'role')}: {message_text(m)[:2000]}" for m in messages)
     try:
-        logging.info(f"Calling OpenAI API with model {model} (retries: {retries})")
-        return openai_client.chat.completions.create(
-            model=model,
-            messages=messages,
-            tools=tools,
-            max_tokens=32000,
-            temperature=0.1,
+        response = await openai_client.chat.completions.create(
+            model=summary_model,
+            messages=[
+                {"role": "system", "content": SUMMARY_PROMPT},
+                {"role": "user", "content": transcript},
+            ],
+            max_tokens=1000,
+            temperature=0,
         )
-    except RateLimitError as e:
-        logging.error(f"Rate limit exceeded: {e}")
-        if retries > 0:
-            sleep_time = 10
-            logging.info(f"Retrying in {sleep_time} seconds...")
-            time.sleep((4-retries)*sleep_time)
-            return call_openai_api(openai_client, messages, tools, retries - 1)
-        return None
+        return response.choices[0].message.content
     except Exception as e:
-        logging.error(f"Unexpected error occurred: {e}")
-        if retries > 0:
-            sleep_time = 10
-            logging.info(f"Retrying in {sleep_time} seconds...")
-            time.sleep((4-retries)*sleep_time)
-            return call_openai_api(openai_client, messages, tools, retries - 1)
+        logging.error("Failed to summarize conversation: %s", e)
         return None
 
-
-async def call_openai_api_handle_tool_calls(openai_client, mcp_client, messages, tools):
-    response = call_openai_api(openai_client, messages, tools)
-    logging.info(f"OpenAI response: {response}")
-    if response is None:
-        return (None, messages)
-
-    if response.choices[0].message.tool_calls:
-        logging.info(f"Tool calls: {response.choices[0].message.tool_calls}")
-        for tool_call in response.choices[0].message.tool_calls:
-            tool_name = tool_call.function.name
-            tool_args = json.loads(tool_call.function.arguments)
-            try:
-                tool_result = await mcp_client.call_tool(tool_name, tool_args)
-                messages.append({"role": "tool", "tool_call_id": tool_call.id, "content": tool_result})
-                logging.info(f"Tool result: {tool_result}")
-            except Exception as e:
-                logging.error(f"Error calling tool {tool_name}: {e}")
-                messages.append({"role": "tool", "tool_call_id": tool_call.id, "content": f"Error calling tool {tool_name}: {e}"})
-        response, messages = await call_openai_api_handle_tool_calls(openai_client, mcp_client, messages, tools)
-        if response is not None and response.choices[0].message.content is not None:
-            print(response.choices[0].message.content)
-            messages.append(response.choices[0].message)
-    return (response, messages)
+async def compact_history(openai_client, messages: list) -> list:
+    """
+    Bound the transcript sent on every turn: keep the system prompt and the
+    most recent messages, and fold the older ones (including any previous
+    summary) into a summary message.
+
+    Args:
+        openai_client: AsyncOpenAI client instance
+        messages: Conversation messages, starting with the system prompt
+
+    Returns:
+        list: The compacted conversation messages
+    """
+    system, history = messages[0], messages[1:]
+    if len(history) <= MAX_HISTORY_MESSAGES and estimate_tokens(history) <= MAX_HISTORY_TOKENS:
+        return messages
+
+    # The window starts on a user message so that tool results are never
+    # separated from the assistant message that requested them. Take the
+    # largest window within both budgets, or at least the last user message.
+    user_indexes = [i for i, m in enumerate(history) if message_field(m, "role") == "user"]
+    if not user_indexes:
+        return messages
+    start = next(
+        (i for i in user_indexes
+         if len(history) - i <= MAX_HISTORY_MESSAGES and estimate_tokens(history[i:]) <= MAX_HISTORY_TOKENS),
+        user_indexes[-1],
+    )
+    dropped, kept = history[:start], history[start:]
+    if not dropped:
+        return messages
+
+    logging.info("Compacting %d messages into a summary", len(dropped))
+    summary = await summarize(openai_client, dropped)
+    if summary is None:
+        return [system] + kept
+    return [system, {"role": "assistant", "content": f"Summary of the earlier conversation: {summary}"}] + kept
+
+async def call_tool(mcp_client, catalog, tools, tool_call: dict):
+    tool_name = tool_call["function"]["name"]
+    tool_args = orjson.loads(tool_call["function"]["arguments"] or "{}")
+    if tool_name == DISCOVERY_TOOL_NAME:
+        return catalog.search(tool_args.get("keyword", ""), tools)
+    async with tool_call_semaphore:
+        return await mcp_client.call_tool(tool_name, tool_args)
+
+def arguments_complete(arguments: str) -> bool:
+    # A JSON object cannot be extended once it parses, so this is final
+    if not arguments.rstrip().endswith("}"):
+        return False
+    try:
+        orjson.loads(arguments)
+        return True
+    except orjson.JSONDecodeError:
+        return False
+
+async def stream_completion(stream, start_tool_call):
+    """
+    Consume a streamed completion, printing the content as it arrives and
+    starting each tool call as soon as its arguments are complete, while the
+    model is still generating the following ones.
+
+    Args:
+        stream: The completion stream
+        start_tool_call: Callback creating the task that runs a tool call
+
+    Returns:
+        tuple: The assistant message and the tool call tasks, in tool call order
+    """
+    content = []
+    tool_calls = {}
+    tasks = {}
+    try:
+        async for chunk in stream:
+            if chunk.usage:
+                logging.info("Token usage: %s", chunk.usage)
+            if not chunk.choices:
+                continue
+            delta = chunk.choices[0].delta
+            if delta.content:
+                print(delta.content, end="", flush=True)
+                content.append(delta.content)
+            for delta_call in delta.tool_calls or ():
+                tool_call = tool_calls.setdefault(delta_call.index, {
+                    "id": None,
+                    "type": "function",
+                    "function": {"name": "", "arguments": ""},
+                })
+                if delta_call.id:
+                    tool_call["id"] = delta_call.id
+                if delta_call.function:
+                    tool_call["function"]["name"] += delta_call.function.name or ""
+                    tool_call["function"]["arguments"] += delta_call.function.arguments or ""
+                if delta_call.index not in tasks and arguments_complete(tool_call["function"]["arguments"]):
+                    tasks[delta_call.index] = start_tool_call(tool_call)
+    except Exception:
+        for task in tasks.values():
+            task.cancel()
+        raise
+    if content:
+        print()
+
+    # Tool calls whose arguments never parsed still run, and report the error
+    for index, tool_call in tool_calls.items():
+        if index not in tasks:
+            tasks[index] = start_tool_call(tool_call)
+
+    message = {"role": "assistant", "content": "".join(content) or None}
+    if tool_calls:
+        message["tool_calls"] = [tool_calls[index] for index in sorted(tool_calls)]
+    return message, [tasks[index] for index in sorted(tasks)]
+
+async def call_openai_api_handle_tool_calls(openai_client, mcp_client, catalog, messages, tools):
+    """
+    Run one user turn: stream the model response and execute the tool calls
+    it requests, until it answers without calling tools.
+
+    Returns:
+        tuple: The final assistant message (None on failure) and the messages
+    """
+    while True:
+        stream = await call_openai_api(openai_client, messages, tools)
+        if stream is None:
+            return (None, messages)
+        try:
+            message, tasks = await stream_completion(
+                stream,
+                lambda tool_call: asyncio.create_task(call_tool(mcp_client, catalog, tools, tool_call)),
+            )
+        except Exception as e:
+            logging.error("Error while streaming the response: %s", e)
+            return (None, messages)
+        messages.append(message)
+        if not tasks:
+            return (message, messages)
+
+        logging.info("Tool calls: %s", message["tool_calls"])
+        results = await asyncio.gather(*tasks, return_exceptions=True)
+        for tool_call, tool_result in zip(message["tool_calls"], results):
+            tool_name = tool_call["function"]["name"]
+            if isinstance(tool_result, Exception):
+                logging.error("Error calling tool %s: %s", tool_name, tool_result)
+                messages.append({"role": "tool", "tool_call_id": tool_call["id"], "content": f"Error calling tool {tool_name}: {tool_result}"})
+            else:
+                messages.append({"role": "tool", "tool_call_id": tool_call["id"], "content": tool_result})
+                logging.info("Tool result: %s", tool_result)
 
 async def main():
     custom_headers = {}
@@ -300,8 +367,16 @@ async def main():
             "Authorization": f"Bearer {os.getenv('GRANITE_API_KEY')}"
         }
 
-    http_client = httpx.Client(headers=custom_headers, verify=False)
-    openai_client = OpenAI(http_client=http_client)
+    # One pooled HTTP/2 client shared by every request for the whole session
+    http_client = httpx.AsyncClient(
+        http2=True,
+        headers=custom_headers,
+        verify=os.getenv("OPENAI_INSECURE_SKIP_VERIFY", "false").lower() != "true",
+        limits=httpx.Limits(max_connections=100, max_keepalive_connections=20),
+        timeout=httpx.Timeout(60.0, connect=5.0),
+    )
+    # call_openai_api does the retrying, the SDK's own retries would multiply its attempts
+    openai_client = AsyncOpenAI(http_client=http_client, max_retries=0)
 
     config = {
         "mcpServers": {
@@ -309,19 +384,22 @@ async def main():
         }
     }
 
-    async with Client(config) as client:
+    async with http_client, Client(config) as client:
         logging.info(f"Querying for tools")
         tools = await client.list_tools()
         logging.info(f"Discovered {len(tools)} tools.")
-        openai_tools = [tool_to_dict(tool) for tool in tools]
-
-        messages = []
-        while True:
-            user_input = input(">")
-            messages.append({"role":"user", "content": user_input})
-            response, messages = await call_openai_api_handle_tool_calls(openai_client, client, messages, openai_tools)
-            print(response.choices[0].message.content)
-            messages.append(response.choices[0].message)
+        catalog = ToolCatalog([tool_to_dict(tool) for tool in tools])
+
+        messages = [{"role": "system", "content": SYSTEM_PROMPT_PATH.read_text()}]
+        # The prompt awaits input on the event loop, so pending I/O keeps progressing
+        # while the user types; patch_stdout keeps output above the prompt line
+        session = PromptSession()
+        with patch_stdout():
+            while True:
+                user_input = await session.prompt_async(">")
+                messages.append({"role":"user", "content": user_input})
+                messages = await compact_history(openai_client, messages)
+                _, messages = await call_openai_api_handle_tool_calls(openai_client, client, catalog, messages, catalog.select(user_input))
 
 if __name__ == "__main__":
     asyncio.run(main())
\ No newline at end of file
@@ -0,0 +1,172 @@
+from typing import Dict, List, Optional, Tuple
+import logging
+import threading
+import time
+
+from kubernetes import watch
+from kubernetes.client.rest import ApiException
+
+from kube_utils import get_kube_informer_client
+
+# Seconds between full relists of a watched resource kind
+resync_period = 600
+
+_informers: Dict[Tuple[str, str, str], "ResourceInformer"] = {}
+_informers_lock = threading.Lock()
+
+
+def configure_informers(resync: int):
+    """
+    Set the resync period used by informers started from now on.
+
+    Args:
+        resync: Seconds between full relists of a watched resource kind
+    """
+    global resync_period
+    resync_period = resync
+
+
+def get_informer(group: str, version: str, plural: str) -> "ResourceInformer":
+    """
+    Returns the shared informer for a resource kind, starting it on first use.
+    The informer syncs in the background: callers must fall back to the API
+    server while it is not synced.
+    """
+    key = (group, version, plural)
+    # Every get and list call comes through here, only take the lock to start an informer
+    informer = _informers.get(key)
+    if informer is not None:
+        return informer
+    with _informers_lock:
+        informer = _informers.get(key)
+        if informer is None:
+            informer = ResourceInformer(group, version, plural, resync_period)
+            _informers[key] = informer
+            informer.start()
+    return informer
+
+
+class ResourceInformer:
+    """
+    In-memory cache of the custom resources of one kind, kept up to date by a watch.
+    Objects are keyed by (namespace, name); namespace is None for cluster-scoped resources.
+    Cached objects are shared between callers and must not be modified.
+    """
+
+    def __init__(self, group: str, version: str, plural: str, resync: int):
+        self.group = group
+        self.version = version
+        self.plural = plural
+        self.resync = resync
+        self._objects: Dict[Tuple[Optional[str], str], dict] = {}
+        # Last resourceVersion seen, so relists can be served from the API server watch cache
+        self._resource_version: Optional[str] = None
+        self._lock = threading.Lock()
+        self._synced = threading.Event()
+
+    def start(self):
+        thread = threading.Thread(target=self._run, name=f"informer-{self.plural}.{self.group}", daemon=True)
+        thread.start()
+
+    @property
+    def synced(self) -> bool:
+        return self._synced.is_set()
+
+    def get(self, name: str, namespace: Optional[str] = None) -> Optional[dict]:
+        """
+        Returns the cached object, or None if it is not cached.
+        """
+        with self._lock:
+            return self._objects.get((namespace, name))
+
+    def names(self, namespace: Optional[str] = None) -> List[str]:
+        """
+        Returns the names of the cached objects, in a namespace if one is given.
+        """
+        with self._lock:
+            return [name for ns, name in self._objects if namespace is None or ns == namespace]
+
+    def invalidate(self, name: str, namespace: Optional[str] = None):
+        """
+        Drop a cached object after it was written, so the next read goes to the
+        API server until the watch delivers the new version.
+        """
+        with self._lock:
+            self._objects.pop((namespace, name), None)
+
+    @staticmethod
+    def _key(obj: dict) -> Tuple[Optional[str], str]:
+        metadata = obj["metadata"]
+        return metadata.get("namespace"), metadata["name"]
+
+    @staticmethod
+    def _slim(obj: dict) -> dict:
+        obj["metadata"].pop("managedFields", None)
+        return obj
+
+    def _relist(self) -> str:
+        k8s_client = get_kube_informer_client()
+        kwargs = {}
+        if self._resource_version is not None:
+            # Any state at least as new as the one already cached will do, which the API server
+            # serves from its watch cache instead of reading through to etcd
+            kwargs = {"resource_version": self._resource_version, "resource_version_match": "NotOlderThan"}
+        resp = k8s_client.list_cluster_custom_object(group=self.group, version=self.version, plural=self.plural, **kwargs)
+        objects = {self._key(item): self._slim(item) for item in resp.get("items", [])}
+        with self._lock:
+            self._objects = objects
+        self._synced.set()
+        self._resource_version = resp["metadata"]["resourceVersion"]
+        logging.info("Informer for %s.%s/%s synced %s objects", self.plural, self.group, self.version, len(objects))
+        return self._resource_version
+
+    def _watch(self, resource_version: str):
+        """
+        Apply watch events until the resync period elapses. An expired watch
+        raises an ApiException with status 410.
+        """
+        k8s_client = get_kube_informer_client()
+        w = watch.Watch()
+        for event in w.stream(
+            k8s_client.list_cluster_custom_object,
+            group=self.group,
+            version=self.version,
+            plural=self.plural,
+            resource_version=resource_version,
+            timeout_seconds=self.resync,
+        ):
+            obj = event["object"]
+            key = self._key(obj)
+            self._resource_version = obj["metadata"]["resourceVersion"]
+            with self._lock:
+                if event["type"] == "DELETED":
+                    self._objects.pop(key, None)
+                else:
+                    self._objects[key] = self._slim(obj)
+
+    def _run(self):
+        retry_delay = 1
+        while True:
+            try:
+                # Each cycle relists, which doubles as the periodic resync
+                self._watch(self._relist())
+                retry_delay = 1
+                continue
+            except ApiException as e:
+                if e.status == 410:
+                    # The resource version is too old to watch from, relist right away
+                    logging.info("Watch for %s.%s expired, relisting", self.plural, self.group)
+                    retry_delay = 1
+                    continue
+                if e.status in (401, 403, 404):
+                    logging.warning("Stopping informer for %s.%s: %s %s", self.plural, self.group, e.status, e.reason)
+                    self._synced.clear()
+                    # Nothing keeps the cache current anymore, drop it rather than serve it
+                    with self._lock:
+                        self._objects = {}
+                    return
+                logging.warning("Informer for %s.%s failed: %s, retrying in %ss", self.plural, self.group, e.reason, retry_delay)
+            except Exception as e:
+                logging.warning("Informer for %s.%s failed: %s, retrying in %ss", self.plural, self.group, e, retry_delay)
+            time.sleep(retry_delay)
+            retry_delay = min(retry_delay * 2, 60)
@@ -1,28 +1,78 @@
+from functools import lru_cache
+import threading
+
 from kubernetes import config, dynamic, client
-from kubernetes.client import api_client
 
-def get_kube_custom_objects_client():
+_config_lock = threading.Lock()
+_config_loaded = False
+
+# Connections kept open to the API server for tool calls. Tool calls run on a pool
+# of as many threads, keeping a connection open for each lets concurrent calls reuse
+# them instead of opening and discarding a new TLS connection once the pool is full.
+# Informer watches hold their connections for long and use a client of their own.
+connection_pool_maxsize = 32
+
+
+def configure_connection_pool(maxsize: int):
     """
-    Returns a Kubernetes client for interacting with custom resources.
+    Set the connection pool size, before the first Kubernetes client is created.
+
+    Args:
+        maxsize: Connections kept open to the API server
+    """
+    global connection_pool_maxsize
+    connection_pool_maxsize = maxsize
+
+def load_config():
+    """
+    Loads the Kubernetes configuration once per process.
     It tries to load the kube config from the local machine first, and if that fails,
     it falls back to loading the in-cluster configuration.
     """
-    try:
-        config.load_kube_config()
-    except config.config_exception.ConfigException:
-        config.load_incluster_config()
-    return client.CustomObjectsApi()
+    global _config_loaded
+    with _config_lock:
+        if _config_loaded:
+            return
+        try:
+            config.load_kube_config()
+        except config.config_exception.ConfigException:
+            config.load_incluster_config()
+        configuration = client.Configuration.get_default_copy()
+        configuration.connection_pool_maxsize = connection_pool_maxsize
+        client.Configuration.set_default(configuration)
+        _config_loaded = True
+
+@lru_cache(maxsize=1)
+def get_kube_api_client():
+    """
+    Returns the API client shared by all Kubernetes clients, so that they
+    reuse a single connection pool to the API server.
+    """
+    load_config()
+    return client.ApiClient()
+
+@lru_cache(maxsize=1)
+def get_kube_custom_objects_client():
+    """
+    Returns a Kubernetes client for interacting with custom resources.
+    The client is created once and shared by all callers.
+    """
+    return client.CustomObjectsApi(get_kube_api_client())
+
+@lru_cache(maxsize=1)
+def get_kube_informer_client():
+    """
+    Returns a Kubernetes client for informers. Each running watch holds a connection
+    for up to the resync period, so informers get an API client of their own instead
+    of taking connections from the pool sized for tool calls.
+    """
+    load_config()
+    return client.CustomObjectsApi(client.ApiClient())
 
+@lru_cache(maxsize=1)
 def get_kube_dynamic_client():
-    try:
-        c = config.load_kube_config()
-    except config.config_exception.ConfigException:
-        c = config.load_incluster_config()
-    return dynamic.DynamicClient(api_client.ApiClient(configuration=c))
+    return dynamic.DynamicClient(get_kube_api_client())
 
+@lru_cache(maxsize=1)
 def get_kube_extensionsv1_client():
-    try:
-        config.load_kube_config()
-    except config.config_exception.ConfigException:
-        config.load_incluster_config()
-    return client.ApiextensionsV1Api()
+    return client.ApiextensionsV1Api(get_kube_api_client())
@@ -2,10 +2,17 @@ from fastmcp import FastMCP
 from fastmcp.tools import FunctionTool
 import logging
 
-from .utils import filter_properties, create_unstructured_object, get_preferred_version
+from .utils import CRDInfo, create_unstructured_object, get_filtered_spec, validate_spec, run_in_thread, tool_name
 
 
-def get_cluster_create_function(crd):
+def get_cluster_create_function(crd: CRDInfo):
+    # Resolved once at registration, the closure only reads plain strings
+    group = crd.group
+    version = crd.version
+    kind = crd.kind
+    plural = crd.plural
+    api_version = f"{group}/{version}"
+
     def create_function(name: str, **kwargs):
         """
         Create a cluster-scoped resource of a specific kind.
@@ -17,15 +24,13 @@ def get_cluster_create_function(crd):
         Returns:
             dict: The created resource object.
         """
-        group = crd.spec.group
-        version = get_preferred_version(crd)  # Use preferred version
-        kind = crd.spec.names.kind
-        plural = crd.spec.names.plural
-        
-        logging.info(f"Creating {kind} with version {version} (group: {group})")
+        error = validate_spec(crd, kwargs)
+        if error is not None:
+            return {"success": False, "error": f"Invalid {kind} spec: {error}", "api_error": False}
+        logging.info("Creating %s with version %s (group: %s)", kind, version, group)
         
         unstructured_object_body = {
-            "apiVersion": f"{group}/{version}",
+            "apiVersion": api_version,
             "kind": kind,
             "metadata": {
                 "name": name,
@@ -35,7 +40,14 @@ def get_cluster_create_function(crd):
         return create_unstructured_object(group, version, kind, plural, unstructured_object_body)
     return create_function
 
-def get_namespaced_create_function(crd):
+def get_namespaced_create_function(crd: CRDInfo):
+    # Resolved once at registration, the closure only reads plain strings
+    group = crd.group
+    version = crd.version
+    kind = crd.kind
+    plural = crd.plural
+    api_version = f"{group}/{version}"
+
     def create_function(name: str, namespace: str, **kwargs):
         """
         Create a namespaced resource of a specific kind.
@@ -48,15 +60,13 @@ def get_namespaced_create_function(crd):
         Returns:
             dict: The created resource object.
         """
-        group = crd.spec.group
-        version = get_preferred_version(crd)  # Use preferred version
-        kind = crd.spec.names.kind
-        plural = crd.spec.names.plural
-
-        logging.info(f"Creating {kind} with version {version} (group: {group}) in namespace {namespace}")
+        error = validate_spec(crd, kwargs)
+        if error is not None:
+            return {"success": False, "error": f"Invalid {kind} spec: {error}", "api_error": False}
+        logging.info("Creating %s with version %s (group: %s) in namespace %s", kind, version, group, namespace)
         
         unstructured_object_body = {
-            "apiVersion": f"{group}/{version}",
+            "apiVersion": api_version,
             "kind": kind,
             "metadata": {
                 "name": name,
@@ -67,24 +77,11 @@ def get_namespaced_create_function(crd):
         return create_unstructured_object(group, version, kind, plural, unstructured_object_body)
     return create_function
 
-def add_create_tool(mcp_server: FastMCP, crd):
-    # Use preferred version for schema selection
-    preferred_version = get_preferred_version(crd)
-    
-    # Find the schema for the preferred version
-    crd_schema = None
-    for version in crd.spec.versions:
-        if version.name == preferred_version:
-            crd_schema = version.schema.open_apiv3_schema
-            break
-    
-    # Fallback to first version schema if preferred version schema not found
-    if crd_schema is None:
-        crd_schema = crd.spec.versions[0].schema.open_apiv3_schema
-        logging.warning(f"Could not find schema for preferred version {preferred_version}, using first version")
-    
-    scope = crd.spec.scope
-    params = filter_properties(crd_schema.properties['spec'].to_dict())
+def add_create_tool(mcp_server: FastMCP, crd: CRDInfo):
+    scope = crd.scope
+    # The cached spec schema is shared, copy the levels modified below
+    spec_params, _ = get_filtered_spec(crd)
+    params = {**spec_params, 'properties': dict(spec_params.get('properties', {}))}
     params['properties']['name'] = {
         "type": "string",
         "description": "The name of the resource to create"
@@ -99,9 +96,9 @@ def add_create_tool(mcp_server: FastMCP, crd):
         fn = get_cluster_create_function(crd)
 
     t = FunctionTool(
-        name="create_" + crd.spec.names.kind.lower(),
+        name=tool_name("create", crd),
         parameters=params,
-        description=f"Create {crd.spec.names.kind} resource",
-        fn=fn,
+        description=f"Create {crd.kind} resource",
+        fn=run_in_thread(fn),
     )
     mcp_server.add_tool(t) 
\ No newline at end of file
@@ -1,43 +1,45 @@
 from fastmcp import FastMCP
 from fastmcp.tools import FunctionTool
-import logging
 
-from .utils import filter_properties, get_preferred_version
+from .utils import CRDInfo, get_filtered_spec, run_in_thread, tool_name
 
 
-def add_doc(mcp_server: FastMCP, crd):
+def get_documentation(crd: CRDInfo):
     """
-    Add an MCP prompt that documents the tool function created for this CRD
+    Build the documentation of a CRD from the schema of its preferred version
     
     Args:
-        mcp: FastMCP server instance
-        crd: Custom Resource Definition object
+        crd: The CRD info
+
+    Returns:
+        dict: The filtered spec schema and the CRD description
     """
-    # Use preferred version for schema selection
-    preferred_version = get_preferred_version(crd)
-    
-    # Find the schema for the preferred version
-    crd_schema = None
-    for version in crd.spec.versions:
-        if version.name == preferred_version:
-            crd_schema = version.schema.open_apiv3_schema
-            break
-    
-    # Fallback to first version schema if preferred version schema not found
-    if crd_schema is None:
-        crd_schema = crd.spec.versions[0].schema.open_apiv3_schema
-        logging.warning(f"Could not find schema for preferred version {preferred_version}, using first version")
+    spec_params, _ = get_filtered_spec(crd)
+    return {**spec_params, 'description': crd.schema.description}
+
+
+def add_doc(mcp_server: FastMCP, crd: CRDInfo):
+    """
+    Add an MCP prompt that documents the tool function created for this CRD.
+    The documentation is built on first use: most CRDs are never documented,
+    so registration does not pay for walking their schema.
     
-    params = filter_properties(crd_schema.properties['spec'].to_dict())
-    params['description'] = crd_schema.description
+    Args:
+        mcp: FastMCP server instance
+        crd: The CRD info
+    """
+    documentation = None
 
     def fn():
-        return params
+        nonlocal documentation
+        if documentation is None:
+            documentation = get_documentation(crd)
+        return documentation
 
     t = FunctionTool(
-        name="get_" + crd.spec.names.kind.lower() + "_documentation",
+        name=tool_name("get", crd, "_documentation"),
         parameters={},
-        description=f"Get full documentation for {crd.spec.names.kind} resource",
-        fn=fn,
+        description=f"Get full documentation for {crd.kind} resource",
+        fn=run_in_thread(fn),
     )
     mcp_server.add_tool(t) 
\ No newline at end of file
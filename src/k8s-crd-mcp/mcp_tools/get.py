@@ -1,15 +1,105 @@
+from concurrent.futures import Future
+from typing import Dict
 from fastmcp import FastMCP
 from fastmcp.tools import FunctionTool
 import logging
+import threading
+import orjson
 
-from kube_utils import get_kube_dynamic_client
-from .utils import get_preferred_version
+from informer import get_informer
+from .utils import CRDInfo, get_api_resource, run_in_thread, tool_name
 
+# Tool parameter schemas, shared by every get tool
+NAMESPACED_GET_PARAMS = {
+    "type": "object",
+    "properties": {
+        "namespace": {
+            "type": "string",
+            "description": "The namespace to list resources from"
+        },
+        "name": {
+            "type": "string",
+            "description": "The name of the resource to get"
+        }
+    },
+    "required": ["namespace", "name"]
+}
+CLUSTER_GET_PARAMS = {
+    "type": "object",
+    "properties": {
+        "name": {
+            "type": "string",
+            "description": "The name of the resource to get"
+        }
+    },
+    "required": ["name"]
+}
+
+def get_resource(group: str, version: str, kind: str, plural: str, name: str, namespace: str = None) -> dict:
+    """
+    Get a resource from the informer cache, falling back to the API server.
+
+    Args:
+        group: The API group of the resource
+        version: The API version of the resource
+        kind: The kind of the resource
+        plural: The plural name of the resource
+        name: The name of the resource
+        namespace: The namespace of the resource, None for cluster-scoped resources
+
+    Returns:
+        dict: The resource object.
+    """
+    informer = get_informer(group, version, plural)
+    if informer.synced:
+        cached = informer.get(name, namespace)
+        if cached is not None:
+            return cached
+    return fetch_resource(group, version, kind, name, namespace)
+
+# API server reads in flight, keyed by (group, version, kind, namespace, name)
+_inflight: Dict[tuple, Future] = {}
+_inflight_lock = threading.Lock()
 
-def get_cluster_get_function(crd):
-    group = crd.spec.group
-    version = get_preferred_version(crd)  # Use preferred version
-    kind = crd.spec.names.kind
+def fetch_resource(group: str, version: str, kind: str, name: str, namespace: str = None) -> dict:
+    """
+    Get a resource from the API server. Concurrent reads of the same object
+    share a single request and its result, which callers must not modify.
+
+    Args:
+        group: The API group of the resource
+        version: The API version of the resource
+        kind: The kind of the resource
+        name: The name of the resource
+        namespace: The namespace of the resource, None for cluster-scoped resources
+
+    Returns:
+        dict: The resource object.
+    """
+    key = (group, version, kind, namespace, name)
+    with _inflight_lock:
+        future = _inflight.get(key)
+        owner = future is None
+        if owner:
+            future = _inflight[key] = Future()
+    if owner:
+        try:
+            api_resource = get_api_resource(group, version, kind)
+            # serialize=False returns the raw response, orjson decodes it without building client models
+            res = api_resource.get(name=name, namespace=namespace, serialize=False)
+            future.set_result(slim(orjson.loads(res.data)))
+        except Exception as e:
+            future.set_exception(e)
+        finally:
+            with _inflight_lock:
+                del _inflight[key]
+    return future.result()
+
+def get_cluster_get_function(crd: CRDInfo):
+    group = crd.group
+    version = crd.version  # Use preferred version
+    kind = crd.kind
+    plural = crd.plural
     def get_function(name: str):
         """
         Get a cluster-scoped resource of a specific kind.
@@ -20,16 +110,14 @@ def get_cluster_get_function(crd):
         Returns:
             dict: The resource object.
         """
-        k8s_client = get_kube_dynamic_client()
-        api_resource = k8s_client.resources.get(api_version=f"{group}/{version}", kind=f"{kind}")
-        res = api_resource.get(name=name)
-        return slim(res.to_dict())
+        return get_resource(group, version, kind, plural, name)
     return get_function
 
-def get_namespaced_get_function(crd):
-    group = crd.spec.group
-    version = get_preferred_version(crd)  # Use preferred version
-    kind = crd.spec.names.kind
+def get_namespaced_get_function(crd: CRDInfo):
+    group = crd.group
+    version = crd.version  # Use preferred version
+    kind = crd.kind
+    plural = crd.plural
     def get_function(namespace: str, name: str):
         """
         Get a namespaced resource of a specific kind.
@@ -41,51 +129,26 @@ def get_namespaced_get_function(crd):
         Returns:
             dict: The resource object.
         """
-        k8s_client = get_kube_dynamic_client()
-        api_resource = k8s_client.resources.get(api_version=f"{group}/{version}", kind=f"{kind}")
-        res = api_resource.get(name=name, namespace=namespace)
-        return slim(res.to_dict())
+        return get_resource(group, version, kind, plural, name, namespace)
     return get_function
 
 def slim(response):
-    del response["metadata"]["managedFields"]
+    response["metadata"].pop("managedFields", None)
     return response
 
-def add_get_tool(mcp_server: FastMCP, crd):
-    scope = crd.spec.scope
-    if scope == "Namespaced":
-        params = {
-            "type": "object",
-            "properties": {
-                "namespace": {
-                    "type": "string",
-                    "description": "The namespace to list resources from"
-                },
-                "name": {
-                    "type": "string",
-                    "description": "The name of the resource to get"
-                }
-            },
-            "required": ["namespace", "name"]
-        }
+def add_get_tool(mcp_server: FastMCP, crd: CRDInfo):
+    kind = crd.kind
+    if crd.scope == "Namespaced":
+        params = {**NAMESPACED_GET_PARAMS}
         fn = get_namespaced_get_function(crd)
     else:
-        params = {
-            "type": "object",
-            "properties": {
-                "name": {
-                    "type": "string",
-                    "description": "The name of the resource to get"
-                }
-            },
-            "required": ["name"]
-        }
+        params = {**CLUSTER_GET_PARAMS}
         fn = get_cluster_get_function(crd)
 
     t = FunctionTool(
-        name="get_" + crd.spec.names.kind.lower(),
+        name=tool_name("get", crd),
         parameters=params,
-        description=f"Get {crd.spec.names.kind} resources. This is a desc",
-        fn=fn,
+        description=f"Get {kind} resources. This is a desc",
+        fn=run_in_thread(fn),
     )
-    mcp_server.add_tool(t) 
\ No newline at end of file
+    mcp_server.add_tool(t)
\ No newline at end of file
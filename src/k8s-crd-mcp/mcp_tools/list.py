@@ -1,38 +1,112 @@
+from typing import List
 import logging
 from fastmcp import FastMCP
 from fastmcp.tools import FunctionTool
 
-from kube_utils import get_kube_custom_objects_client
-from .utils import get_preferred_version
+from informer import get_informer
+from .utils import CRDInfo, get_api_resource, run_in_thread, tool_name
 
+# Ask the API server for metadata only: the tools return names, so specs and statuses are never needed
+METADATA_ONLY_HEADERS = {"Accept": "application/json;as=PartialObjectMetadataList;g=meta.k8s.io;v=v1"}
 
-def get_cluster_list_function(crd):
-    def list_function(namespace: str):
+# Tool parameter schemas, shared by every list tool
+NAMESPACED_LIST_PARAMS = {
+    "type": "object",
+    "properties": {
+        "namespace": {
+            "type": "string",
+            "description": "The namespace to list resources from"
+        }
+    },
+    "required": ["namespace"]
+}
+CLUSTER_LIST_PARAMS = {
+    "type": "object",
+    "properties": {}
+}
+
+# Objects per list request, so a large collection is never decoded in one response
+LIST_PAGE_SIZE = 500
+
+
+def list_names(group: str, version: str, kind: str, plural: str, namespace: str = None) -> List[str]:
+    """
+    List the names of the resources of a kind from the informer cache, or from
+    the API server until the informer has synced.
+
+    Args:
+        group: The API group of the resource
+        version: The API version of the resource
+        kind: The kind of the resource
+        plural: The plural name of the resource
+        namespace: The namespace to list from, None for all namespaces or cluster-scoped resources
+
+    Returns:
+        List[str]: The resource names
+    """
+    informer = get_informer(group, version, plural)
+    if informer.synced:
+        return informer.names(namespace)
+    return fetch_names(group, version, kind, namespace)
+
+
+def fetch_names(group: str, version: str, kind: str, namespace: str = None) -> List[str]:
+    """
+    List the names of the resources of a kind from the API server, one page at a time.
+
+    Args:
+        group: The API group of the resource
+        version: The API version of the resource
+        kind: The kind of the resource
+        namespace: The namespace to list from, None for all namespaces or cluster-scoped resources
+
+    Returns:
+        List[str]: The resource names
+    """
+    api_resource = get_api_resource(group, version, kind)
+    names = []
+    continue_token = None
+    while True:
+        page = api_resource.get(
+            namespace=namespace,
+            limit=LIST_PAGE_SIZE,
+            _continue=continue_token,
+            header_params=dict(METADATA_ONLY_HEADERS)
+        )
+        names.extend(item.metadata.name for item in page.items or [])
+        continue_token = getattr(page.metadata, "continue", None)
+        if not continue_token:
+            return names
+
+
+def get_cluster_list_function(crd: CRDInfo):
+    # Resolved once at registration, the closure only reads plain strings
+    group = crd.group
+    version = crd.version
+    kind = crd.kind
+    plural = crd.plural
+
+    def list_function():
         """
         List all cluster-scoped resources of a specific kind
 
         Returns:
             List[str]: A list of resource objects.
         """
-        k8s_client = get_kube_custom_objects_client()
-        group = crd.spec.group
-        version = get_preferred_version(crd)
-        kind = crd.spec.names.kind
-        plural = crd.spec.names.plural
-
-        crd_list = k8s_client.list_cluster_custom_object(
-            group=group,
-            version=version,
-            plural=plural
-        )
-        logging.info(f"Listed {len(crd_list.get('items', []))} {kind} resources in cluster")
-        if 'items' not in crd_list:
-            logging.warning(f"No items found in namespace {namespace} for {kind}")
-            return []
-        return [item['metadata']['name'] for item in crd_list['items']]
+        names = list_names(group, version, kind, plural)
+        logging.info(f"Listed {len(names)} {kind} resources in cluster")
+        if not names:
+            logging.warning(f"No items found in cluster for {kind}")
+        return names
     return list_function
 
-def get_namespaced_list_function(crd):
+def get_namespaced_list_function(crd: CRDInfo):
+    # Resolved once at registration, the closure only reads plain strings
+    group = crd.group
+    version = crd.version
+    kind = crd.kind
+    plural = crd.plural
+
     def list_function(namespace: str):
         """
         List all resources of a specific kind in a given namespace.
@@ -43,51 +117,31 @@ def get_namespaced_list_function(crd):
         Returns:
             List[str]: A list of resource objects.
         """
-        k8s_client = get_kube_custom_objects_client()
-        group = crd.spec.group
-        version = get_preferred_version(crd)
-        kind = crd.spec.names.kind
-        plural = crd.spec.names.plural
-
         logging.info(f"Listing group: {group} version: {version} plural: {plural} resources in namespace {namespace}")
         try:
-            crd_list = k8s_client.list_namespaced_custom_object(
-                group=group,
-                version=version,
-                namespace=namespace,
-                plural=plural
-            )
+            names = list_names(group, version, kind, plural, namespace)
         except Exception as e:
             logging.error(f"Failed to list resources: group: {group}, version: {version}, kind: {kind}, plural: {plural}, namespace: {namespace}, error: {e}")
             return []
-        logging.info(f"Listed {len(crd_list.get('items', []))} {kind} resources in namespace {namespace}")
-        if 'items' not in crd_list:
+        logging.info(f"Listed {len(names)} {kind} resources in namespace {namespace}")
+        if not names:
             logging.warning(f"No items found in namespace {namespace} for {kind}")
-            return []
-        return [item['metadata']['name'] for item in crd_list['items']]
+        return names
     return list_function
 
-def add_list_tool(mcp_server: FastMCP, crd):
-    scope = crd.spec.scope
-    if scope == "Namespaced":
-        params = {
-            "type": "object",
-            "properties": {
-                "namespace": {
-                    "type": "string",
-                    "description": "The namespace to list resources from"
-                }
-            },
-            "required": ["namespace"]
-        }
+def add_list_tool(mcp_server: FastMCP, crd: CRDInfo):
+    kind = crd.kind
+    if crd.scope == "Namespaced":
+        params = {**NAMESPACED_LIST_PARAMS}
         fn = get_namespaced_list_function(crd)
     else:
+        params = {**CLUSTER_LIST_PARAMS}
         fn = get_cluster_list_function(crd)
 
     t = FunctionTool(
-        name="list_" + crd.spec.names.kind.lower(),
+        name=tool_name("list", crd),
         parameters=params,
-        description=f"List all {crd.spec.names.kind} resources. This is a desc",
-        fn=fn,
+        description=f"List all {kind} resources. This is a desc",
+        fn=run_in_thread(fn),
     )
-    mcp_server.add_tool(t) 
\ No newline at end of file
+    mcp_server.add_tool(t)
\ No newline at end of file
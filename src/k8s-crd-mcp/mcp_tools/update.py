@@ -1,11 +1,18 @@
 from fastmcp import FastMCP
 from fastmcp.tools import FunctionTool
-import logging
 
-from .utils import filter_properties, update_unstructured_object, get_preferred_version
+from .utils import CRDInfo, update_unstructured_object, get_filtered_spec, run_in_thread, tool_name
 
 
-def get_cluster_update_function(crd):
+def get_cluster_update_function(crd: CRDInfo):
+    # Resolved once at registration, the closure only reads plain strings
+    group = crd.group
+    version = crd.version
+    kind = crd.kind
+    plural = crd.plural
+    # Fields shared by every update body of this kind
+    body_template = {"apiVersion": f"{group}/{version}", "kind": kind}
+
     def update_function(name: str, **kwargs):
         """
         Update a cluster-scoped resource of a specific kind.
@@ -17,13 +24,8 @@ def get_cluster_update_function(crd):
         Returns:
             dict: The updated resource object.
         """
-        group = crd.spec.group
-        version = get_preferred_version(crd)  # Use preferred version
-        kind = crd.spec.names.kind
-        plural = crd.spec.names.plural
         unstructured_object_body = {
-            "apiVersion": f"{group}/{version}",
-            "kind": kind,
+            **body_template,
             "metadata": {
                 "name": name,
             },
@@ -32,7 +34,15 @@ def get_cluster_update_function(crd):
         return update_unstructured_object(group, version, kind, plural, unstructured_object_body)
     return update_function
 
-def get_namespaced_update_function(crd):
+def get_namespaced_update_function(crd: CRDInfo):
+    # Resolved once at registration, the closure only reads plain strings
+    group = crd.group
+    version = crd.version
+    kind = crd.kind
+    plural = crd.plural
+    # Fields shared by every update body of this kind
+    body_template = {"apiVersion": f"{group}/{version}", "kind": kind}
+
     def update_function(name: str, namespace: str, **kwargs):
         """
         Update a namespaced resource of a specific kind.
@@ -45,14 +55,8 @@ def get_namespaced_update_function(crd):
         Returns:
             dict: The updated resource object.
         """
-        group = crd.spec.group
-        version = get_preferred_version(crd)  # Use preferred version
-        kind = crd.spec.names.kind
-        plural = crd.spec.names.plural
-
         unstructured_object_body = {
-            "apiVersion": f"{group}/{version}",
-            "kind": kind,
+            **body_template,
             "metadata": {
                 "name": name,
                 "namespace": namespace
@@ -63,24 +67,11 @@ def get_namespaced_update_function(crd):
     return update_function
 
 
-def add_update_tool(mcp_server: FastMCP, crd):
-    # Use preferred version for schema selection
-    preferred_version = get_preferred_version(crd)
-    
-    # Find the schema for the preferred version
-    crd_schema = None
-    for version in crd.spec.versions:
-        if version.name == preferred_version:
-            crd_schema = version.schema.open_apiv3_schema
-            break
-    
-    # Fallback to first version schema if preferred version schema not found
-    if crd_schema is None:
-        crd_schema = crd.spec.versions[0].schema.open_apiv3_schema
-        logging.warning(f"Could not find schema for preferred version {preferred_version}, using first version")
-    
-    scope = crd.spec.scope
-    params = filter_properties(crd_schema.properties['spec'].to_dict(), remove_props=["required"])
+def add_update_tool(mcp_server: FastMCP, crd: CRDInfo):
+    scope = crd.scope
+    # The cached schema is shared with other tools, copy the level we extend
+    _, spec_params = get_filtered_spec(crd)
+    params = {**spec_params, 'properties': dict(spec_params.get('properties', {}))}
     params['properties']['name'] = {
         "type": "string",
         "description": "The name of the resource to update"
@@ -95,9 +86,9 @@ def add_update_tool(mcp_server: FastMCP, crd):
         fn = get_cluster_update_function(crd)
 
     t = FunctionTool(
-        name="update_" + crd.spec.names.kind.lower(),
+        name=tool_name("update", crd),
         parameters=params,
-        description=f"Update {crd.spec.names.kind} resource",
-        fn=fn,
+        description=f"Update {crd.kind} resource",
+        fn=run_in_thread(fn),
     )
     mcp_server.add_tool(t) 
\ No newline at end of file
@@ -1,14 +1,74 @@
-from typing import Dict
+from typing import Callable, Dict, Optional, Tuple
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+import asyncio
+import functools
 import logging
+import sys
+import fastjsonschema
+import orjson
 from kubernetes.client.rest import ApiException
 
-from kube_utils import get_kube_custom_objects_client, get_kube_dynamic_client
+from informer import get_informer
+import kube_utils
+from kube_utils import get_kube_api_client, get_kube_custom_objects_client, get_kube_dynamic_client
+
+# Field manager recorded for server-side applied fields
+FIELD_MANAGER = "k8s-crd-mcp"
+
+
+@functools.lru_cache(maxsize=1)
+def get_tool_executor() -> ThreadPoolExecutor:
+    """
+    Returns the worker threads for blocking tool calls, one per pooled API server connection.
+    The default asyncio executor only has cpu_count + 4 threads, which caps concurrent
+    tool calls at a handful on small nodes.
+    """
+    return ThreadPoolExecutor(max_workers=kube_utils.connection_pool_maxsize, thread_name_prefix="tool")
+
+
+def run_in_thread(fn):
+    """
+    Wrap a blocking tool function so FastMCP awaits it in a worker thread.
+    FastMCP runs synchronous tool functions on the event loop, which would
+    serialize concurrent tool calls behind each Kubernetes API request.
+
+    Args:
+        fn: The blocking tool function
+
+    Returns:
+        A coroutine function with the same signature as fn
+    """
+    @functools.wraps(fn)
+    async def wrapper(*args, **kwargs):
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(get_tool_executor(), functools.partial(fn, *args, **kwargs))
+    return wrapper
+
+
+@functools.lru_cache(maxsize=None)
+def get_api_resource(group: str, version: str, kind: str):
+    """
+    Returns the dynamic client resource for a kind.
+    Resolving it runs API discovery, so it is done once per kind and shared.
+
+    Args:
+        group: The API group of the resource
+        version: The API version of the resource
+        kind: The kind of the resource
+    """
+    return get_kube_dynamic_client().resources.get(api_version=f"{group}/{version}", kind=kind)
+
+
+# Preferred versions, keyed by (CRD name, resourceVersion)
+_preferred_version_cache: Dict[tuple, str] = {}
 
 
 def get_preferred_version(crd):
     """
     Get the preferred version for API operations.
     Prefers the storage version, falls back to the first served version.
+    The result is cached per CRD revision.
     
     Args:
         crd: Custom Resource Definition object
@@ -16,6 +76,17 @@ def get_preferred_version(crd):
     Returns:
         str: The preferred version name
     """
+    key = (crd.metadata.name, crd.metadata.resource_version)
+    version = _preferred_version_cache.get(key)
+    if version is None:
+        version = _preferred_version_cache[key] = find_preferred_version(crd)
+    return version
+
+
+def find_preferred_version(crd):
+    """
+    Resolve the preferred version from the CRD spec, uncached.
+    """
     storage_version = None
     served_versions = []
     
@@ -26,10 +97,10 @@ def get_preferred_version(crd):
                 storage_version = version
     
     if storage_version:
-        logging.debug(f"Using storage version {storage_version.name} for CRD {crd.metadata.name}")
+        logging.debug("Using storage version %s for CRD %s", storage_version.name, crd.metadata.name)
         return storage_version.name
     elif served_versions:
-        logging.debug(f"Using first served version {served_versions[0].name} for CRD {crd.metadata.name}")
+        logging.debug("Using first served version %s for CRD %s", served_versions[0].name, crd.metadata.name)
         return served_versions[0].name
     else:
         # Fallback to first version if no served versions found
@@ -38,7 +109,217 @@ def get_preferred_version(crd):
         return fallback_version
 
 
-def filter_properties(properties: Dict, remove_props = []) -> Dict:
+def get_preferred_schema(crd):
+    """
+    Get the preferred version and its OpenAPI v3 schema.
+    Falls back to the schema of the first version if the preferred one has none.
+
+    Args:
+        crd: Custom Resource Definition object
+
+    Returns:
+        tuple: The preferred version name and its schema
+    """
+    preferred_version = get_preferred_version(crd)
+    schema_by_version = {version.name: version.schema.open_apiv3_schema for version in crd.spec.versions}
+    crd_schema = schema_by_version.get(preferred_version)
+    if crd_schema is None:
+        crd_schema = crd.spec.versions[0].schema.open_apiv3_schema
+        logging.warning(f"Could not find schema for preferred version {preferred_version}, using first version")
+    return preferred_version, crd_schema
+
+
+@dataclass(slots=True)
+class CRDInfo:
+    """
+    The fields of a CRD the tools read, copied out of the client model once.
+    Client model attributes are property lookups, slot reads are not.
+    """
+    name: str
+    resource_version: str
+    group: str
+    version: str
+    kind: str
+    # Lowercased kind used in tool names
+    kind_lower: str
+    plural: str
+    scope: str
+    # OpenAPI v3 schema model of the preferred version, converted on first use
+    schema: object
+
+
+def get_crd_info(crd) -> CRDInfo:
+    """
+    Build the CRDInfo of a Custom Resource Definition for its preferred version.
+
+    Args:
+        crd: Custom Resource Definition object
+
+    Returns:
+        CRDInfo: The fields used to build and run the tools
+    """
+    version, crd_schema = get_preferred_schema(crd)
+    return CRDInfo(
+        name=crd.metadata.name,
+        resource_version=crd.metadata.resource_version,
+        group=crd.spec.group,
+        version=version,
+        kind=crd.spec.names.kind,
+        kind_lower=crd.spec.names.kind.lower(),
+        plural=crd.spec.names.plural,
+        scope=crd.spec.scope,
+        schema=crd_schema,
+    )
+
+
+def tool_name(action: str, crd: CRDInfo, suffix: str = "") -> str:
+    """
+    Build the name of a CRD tool, e.g. get_widget or get_widget_documentation.
+    Names are interned since FastMCP looks tools up by name on every call.
+    """
+    return sys.intern(f"{action}_{crd.kind_lower}{suffix}")
+
+
+# Filtered spec schemas, keyed by (CRD name, resourceVersion)
+_filtered_spec_cache: Dict[tuple, Tuple[Dict, Dict]] = {}
+
+
+def get_filtered_spec(crd: CRDInfo) -> Tuple[Dict, Dict]:
+    """
+    Get the filtered spec schema of the preferred version of a CRD, with and
+    without its top level required list.
+    The schema is converted and filtered once per CRD revision and both variants
+    share their nested schemas: callers must not modify them.
+
+    Args:
+        crd: The CRD info
+
+    Returns:
+        tuple: The filtered spec schema, and the same schema without required
+    """
+    key = (crd.name, crd.resource_version)
+    filtered = _filtered_spec_cache.get(key)
+    if filtered is None:
+        full = filter_properties(crd.schema.properties['spec'].to_dict())
+        # filter_properties only removes keys at the top level, so a shallow copy is the same as a second pass
+        without_required = {k: v for k, v in full.items() if k != "required"}
+        filtered = _filtered_spec_cache[key] = (full, without_required)
+    return filtered
+
+
+def get_validation_schema(crd: CRDInfo) -> Dict:
+    """
+    Get the spec schema of a CRD as JSON Schema, unfiltered, so that it accepts
+    what the API server accepts. Kubernetes' nullable becomes a "null" type and
+    formats are dropped: Kubernetes defines its own (int32, quantity, ...) and
+    leaves them to the API server.
+
+    Args:
+        crd: The CRD info
+
+    Returns:
+        dict: The JSON Schema of the resource spec
+    """
+    # Serializing the client model gives the schema with its JSON keys, to_dict() gives attribute names
+    spec_schema = get_kube_api_client().sanitize_for_serialization(crd.schema.properties['spec'])
+    stack = [spec_schema]
+    while stack:
+        schema = stack.pop()
+        schema.pop("format", None)
+        if schema.pop("nullable", False):
+            if "type" in schema:
+                schema["type"] = [schema["type"], "null"]
+            if "enum" in schema:
+                schema["enum"] = schema["enum"] + [None]
+        stack.extend(schema.get("properties", {}).values())
+        for key in ("items", "additionalProperties", "not", "allOf", "anyOf", "oneOf"):
+            nested = schema.get(key)
+            if isinstance(nested, dict):
+                stack.append(nested)
+            elif isinstance(nested, list):
+                stack.extend(nested)
+    return spec_schema
+
+
+# Compiled spec validators, keyed by (CRD name, resourceVersion)
+_spec_validator_cache: Dict[tuple, Optional[Callable]] = {}
+
+
+def validate_spec(crd: CRDInfo, spec: dict) -> Optional[str]:
+    """
+    Validate a resource spec against the spec schema of a CRD.
+    The validator is generated on first use and cached per CRD revision.
+
+    Args:
+        crd: The CRD info
+        spec: The resource spec to validate
+
+    Returns:
+        The validation error message, or None if the spec is valid
+    """
+    key = (crd.name, crd.resource_version)
+    if key not in _spec_validator_cache:
+        try:
+            # use_default=False: defaults are left to the API server
+            _spec_validator_cache[key] = fastjsonschema.compile(get_validation_schema(crd), use_default=False)
+        except fastjsonschema.JsonSchemaDefinitionException as e:
+            logging.warning("Could not compile spec validator for CRD %s: %s", crd.name, e)
+            _spec_validator_cache[key] = None
+    validator = _spec_validator_cache[key]
+    if validator is None:
+        return None
+    try:
+        validator(spec)
+    except fastjsonschema.JsonSchemaValueException as e:
+        return e.message
+    return None
+
+
+# Handlers of the schema keywords kept by filter_properties. Each one copies a
+# keyword into the filtered schema and queues the nested schemas it holds.
+def _filter_enum(target: Dict, key: str, prop, stack: list):
+    # Enums are usually clean already, only copy them when there is something to drop
+    target[key] = prop if all(prop) else [value for value in prop if value]
+
+
+def _filter_nested_properties(target: Dict, key: str, prop, stack: list):
+    nested = target[key] = {}
+    for name, sub in prop.items():
+        # Hyperthreading is causing issues with gemini-cli client-side validation, @TODO: investigate
+        if name != "hyperthreading":
+            nested[name] = {}
+            stack.append((sub, nested[name], _SCHEMA_HANDLERS))
+
+
+def _filter_items(target: Dict, key: str, prop, stack: list):
+    target[key] = {}
+    stack.append((prop, target[key], _SCHEMA_HANDLERS))
+
+
+def _filter_description(target: Dict, key: str, prop, stack: list):
+    # Equal descriptions repeat across and within CRDs, keep one copy of each
+    target[key] = sys.intern(prop[:100])
+
+
+def _copy_keyword(target: Dict, key: str, prop, stack: list):
+    target[key] = prop
+
+
+_SCHEMA_HANDLERS = {
+    "enum": _filter_enum,
+    "properties": _filter_nested_properties,
+    "items": _filter_items,
+    "description": _filter_description,
+    "type": _copy_keyword,
+    "required": _copy_keyword,
+    "default": _copy_keyword,
+}
+
+# Keywords remove_props cannot drop
+_KEPT_KEYWORDS = frozenset(("enum", "properties"))
+
+
+def filter_properties(properties: Dict, remove_props=()) -> Dict:
     """
     Filter properties to only include those that are not read-only.
 
@@ -50,33 +331,43 @@ def filter_properties(properties: Dict, remove_props = []) -> Dict:
         A dictionary containing only the writable properties.
     """
     filtered_properties = {}
-    for key, prop in properties.items():
-        # Hyperthreading is a special case - somehow it's breaking gemini-cli client-side validation @TODO: investigate
-        if key == "hyperthreading":
-            logging.info(f"Adding hyperthreading: {key}")
-        if key == "enum" and prop is not None:
-            filtered_properties[key] = list(filter(None, prop))
-        if key in ["type", "description", "required", "items", "default"] and key not in remove_props:
-            if key in properties and properties[key] is not None:
-                if key == "items":
-                    filtered_properties[key] = filter_properties(properties[key])
-                else:
-                    filtered_properties[key] = properties[key]
-                if key == "description":
-                    filtered_properties[key] = properties[key][:100]
-
-    if "properties" in properties and properties["properties"] is not None:
-        filtered_properties["properties"] = {}
-        for key, prop in properties["properties"].items():
-            # This property is causing issues, @TODO: investigate
-            if key not in ["hyperthreading"]:
-                filtered_properties["properties"][key] = filter_properties(prop)
+    # remove_props only applies to the top level schema
+    handlers = _SCHEMA_HANDLERS
+    if remove_props:
+        handlers = {key: handler for key, handler in _SCHEMA_HANDLERS.items()
+                    if key in _KEPT_KEYWORDS or key not in remove_props}
+    # Nested schemas are filtered from a worklist instead of recursing, so deep CRDs do not pay a call per node
+    stack = [(properties, filtered_properties, handlers)]
+    while stack:
+        source, target, handlers = stack.pop()
+        for key, prop in source.items():
+            if prop is None:
+                continue
+            handler = handlers.get(key)
+            if handler is not None:
+                handler(target, key, prop, stack)
     return filtered_properties
 
 
+class LazyJSON:
+    """
+    Log argument that renders a resource body as JSON with orjson, and only
+    when the record is actually formatted.
+    """
+    __slots__ = ("obj",)
+
+    def __init__(self, obj):
+        self.obj = obj
+
+    def __str__(self) -> str:
+        return orjson.dumps(self.obj, default=str, option=orjson.OPT_NON_STR_KEYS).decode()
+
+
 def create_unstructured_object(group: str, version: str, kind: str, plural: str, unstructured_object_body: dict):
     """
-    Create a Kubernetes custom resource object.
+    Create a Kubernetes custom resource object with server-side apply, so that
+    replaying a create succeeds instead of failing with a conflict.
+    Falls back to a plain create if the API server does not support it.
 
     Args:
         group: The API group of the resource
@@ -88,38 +379,31 @@ def create_unstructured_object(group: str, version: str, kind: str, plural: str,
     Returns:
         dict: Success/error status
     """
-    api_client = get_kube_custom_objects_client()
-    
-    # Log detailed information about what we're trying to create
-    logging.info(f"Attempting to create resource:")
-    logging.info(f"  Group: {group}")
-    logging.info(f"  Version: {version}")
-    logging.info(f"  Kind: {kind}")
-    logging.info(f"  Plural: {plural}")
-    logging.info(f"  API Version: {group}/{version}")
-    logging.info(f"  Resource body: {unstructured_object_body}")
+    # Log detailed information about what we're trying to create, the body is only rendered at DEBUG
+    logging.debug("Attempting to create resource: group: %s, version: %s, kind: %s, plural: %s, body: %s",
+                  group, version, kind, plural, LazyJSON(unstructured_object_body))
+
+    metadata = unstructured_object_body['metadata']
     
     try:
-        if 'namespace' in unstructured_object_body['metadata'].keys():
-            namespace = unstructured_object_body['metadata']['namespace']
-            logging.info(f"Creating namespaced resource in namespace: {namespace}")
-            created_object = api_client.create_namespaced_custom_object(
-                group=group, 
-                version=version, 
-                plural=plural, 
-                namespace=namespace, 
-                body=unstructured_object_body
-            )
-            logging.info(f"Successfully created namespaced resource {kind} in namespace {namespace}")
-        else:
-            logging.info(f"Creating cluster-scoped resource")
-            created_object = api_client.create_cluster_custom_object(
-                group=group, 
-                version=version, 
-                plural=plural, 
-                body=unstructured_object_body
-            )
-            logging.info(f"Successfully created cluster-scoped resource {kind}")
+        try:
+            api_resource = get_api_resource(group, version, kind)
+            created_object = api_resource.server_side_apply(
+                body=unstructured_object_body,
+                name=metadata['name'],
+                namespace=metadata.get('namespace'),
+                field_manager=FIELD_MANAGER,
+                force_conflicts=False
+            ).to_dict()
+            created_object['metadata'].pop('managedFields', None)
+            logging.info("Successfully applied resource %s %s", kind, metadata['name'])
+        except ApiException as e:
+            if e.status != 415:
+                raise
+            logging.info("Server-side apply is not supported, creating %s %s", kind, metadata['name'])
+            created_object = post_unstructured_object(group, version, kind, plural, unstructured_object_body)
+        # Reads go to the API server until the watch delivers the applied object
+        get_informer(group, version, plural).invalidate(metadata['name'], metadata.get('namespace'))
         
         if created_object:
             return {"success": True, "resource": created_object}
@@ -133,11 +417,8 @@ def create_unstructured_object(group: str, version: str, kind: str, plural: str,
             "body": e.body,
             "headers": dict(e.headers) if e.headers else None
         }
-        logging.error(f"Kubernetes API error when creating {kind}:")
-        logging.error(f"  Status: {e.status}")
-        logging.error(f"  Reason: {e.reason}")
-        logging.error(f"  Body: {e.body}")
-        logging.error(f"  Headers: {e.headers}")
+        logging.error("Kubernetes API error when creating %s %s: status: %s, reason: %s", kind, metadata['name'], e.status, e.reason)
+        logging.debug("  Body: %s, headers: %s", e.body, e.headers)
         
         return {
             "success": False, 
@@ -147,10 +428,8 @@ def create_unstructured_object(group: str, version: str, kind: str, plural: str,
         }
     except Exception as e:
         # Log the full error details
-        logging.error(f"Failed to create resource: group: {group}, version: {version}, kind: {kind}, plural: {plural}")
-        logging.error(f"Request body: {unstructured_object_body}")
-        logging.error(f"Error: {str(e)}")
-        logging.error(f"Error type: {type(e)}")
+        logging.error("Failed to create resource: group: %s, version: %s, kind: %s, plural: %s, error: %r", group, version, kind, plural, e)
+        logging.debug("Request body: %s", LazyJSON(unstructured_object_body))
         
         return {
             "success": False, 
@@ -159,6 +438,38 @@ def create_unstructured_object(group: str, version: str, kind: str, plural: str,
         }
 
 
+def post_unstructured_object(group: str, version: str, kind: str, plural: str, unstructured_object_body: dict):
+    """
+    Create a Kubernetes custom resource object with a plain POST.
+
+    Returns:
+        dict: The created resource object
+    """
+    api_client = get_kube_custom_objects_client()
+    metadata = unstructured_object_body['metadata']
+    if 'namespace' in metadata:
+        namespace = metadata['namespace']
+        logging.info("Creating namespaced resource in namespace: %s", namespace)
+        created_object = api_client.create_namespaced_custom_object(
+            group=group, 
+            version=version, 
+            plural=plural, 
+            namespace=namespace, 
+            body=unstructured_object_body
+        )
+        logging.info("Successfully created namespaced resource %s in namespace %s", kind, namespace)
+    else:
+        logging.info("Creating cluster-scoped resource")
+        created_object = api_client.create_cluster_custom_object(
+            group=group, 
+            version=version, 
+            plural=plural, 
+            body=unstructured_object_body
+        )
+        logging.info("Successfully created cluster-scoped resource %s", kind)
+    return created_object
+
+
 def update_unstructured_object(group: str, version: str, kind: str, plural: str, unstructured_object_body: dict):
     """
     Update a Kubernetes custom resource object.
@@ -173,31 +484,35 @@ def update_unstructured_object(group: str, version: str, kind: str, plural: str,
     Returns:
         dict: Success/error status
     """
-    api_client = get_kube_dynamic_client()
-    
-    logging.info(f"Attempting to update resource:")
-    logging.info(f"  Group: {group}")
-    logging.info(f"  Version: {version}")
-    logging.info(f"  Kind: {kind}")
-    logging.info(f"  Resource body: {unstructured_object_body}")
+    metadata = unstructured_object_body['metadata']
+    logging.info("Updating %s %s (group: %s, version: %s)", kind, metadata['name'], group, version)
+    logging.debug("  Resource body: %s", LazyJSON(unstructured_object_body))
     
     try:
-        api_resource = api_client.resources.get(api_version=f"{group}/{version}", kind=kind)
+        api_resource = get_api_resource(group, version, kind)
         
-        if 'namespace' in unstructured_object_body['metadata'].keys():
-            api_resource.patch(
+        if 'namespace' in metadata:
+            resp = api_resource.patch(
                 body=unstructured_object_body,
-                name=unstructured_object_body['metadata']['name'],
-                namespace=unstructured_object_body['metadata']['namespace'],
-                content_type="application/merge-patch+json"
+                name=metadata['name'],
+                namespace=metadata['namespace'],
+                content_type="application/merge-patch+json",
+                # The patched object is not returned, skip decoding it
+                serialize=False
             )
-            return {"success": True}
         else:
-            api_resource.patch(
+            resp = api_resource.patch(
                 body=unstructured_object_body,
-                name=unstructured_object_body['metadata']['name'],
-                content_type="application/merge-patch+json"
+                name=metadata['name'],
+                content_type="application/merge-patch+json",
+                # The patched object is not returned, skip decoding it
+                serialize=False
             )
+        # The raw response is not preloaded, read it so its connection goes back to the pool
+        resp.read()
+        resp.release_conn()
+        # Reads go to the API server until the watch delivers the patched object
+        get_informer(group, version, plural).invalidate(metadata['name'], metadata.get('namespace'))
         return {"success": True}
     except ApiException as e:
         error_details = {
@@ -206,10 +521,8 @@ def update_unstructured_object(group: str, version: str, kind: str, plural: str,
             "body": e.body,
             "headers": dict(e.headers) if e.headers else None
         }
-        logging.error(f"Kubernetes API error when updating {kind}:")
-        logging.error(f"  Status: {e.status}")
-        logging.error(f"  Reason: {e.reason}")
-        logging.error(f"  Body: {e.body}")
+        logging.error("Kubernetes API error when updating %s %s: status: %s, reason: %s", kind, metadata['name'], e.status, e.reason)
+        logging.debug("  Body: %s", e.body)
         
         return {
             "success": False, 
@@ -218,7 +531,7 @@ def update_unstructured_object(group: str, version: str, kind: str, plural: str,
             "api_error": True
         }
     except Exception as e:
-        logging.error(f"Unexpected error when updating {kind}: {str(e)}")
+        logging.error("Unexpected error when updating %s: %s", kind, e)
         return {
             "success": False, 
             "error": f"Unexpected error updating {kind}: {str(e)}",
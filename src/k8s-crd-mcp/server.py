@@ -1,26 +1,55 @@
+from concurrent.futures import ThreadPoolExecutor
 from typing import Dict, List, Optional
 from fastmcp import FastMCP
-from kube_utils import  get_kube_extensionsv1_client, get_kube_dynamic_client
+from kubernetes.client.rest import ApiException
+from kube_utils import  configure_connection_pool, get_kube_extensionsv1_client, get_kube_dynamic_client
+from informer import configure_informers
 from mcp_tools.create import add_create_tool
 from mcp_tools.docs import add_doc
 from mcp_tools.list import add_list_tool
 from mcp_tools.update import add_update_tool
 from mcp_tools.get import add_get_tool
+from mcp_tools.utils import CRDInfo, get_crd_info
+import atexit
 import logging
+import logging.handlers
+import queue
 import sys
 import argparse
 import yaml
+try:
+    from yaml import CSafeLoader as YamlSafeLoader
+except ImportError:
+    # PyYAML built without libyaml
+    from yaml import SafeLoader as YamlSafeLoader
 from pathlib import Path
 
+# Tool calls only enqueue log records, a listener thread owns the stdout writes
+log_queue = queue.Queue(-1)
+log_stream_handler = logging.StreamHandler(sys.stdout)
+log_stream_handler.setFormatter(logging.Formatter('%(asctime)s - %(levelname)s - %(message)s', datefmt='%Y-%m-%d %H:%M:%S'))
+log_listener = logging.handlers.QueueListener(log_queue, log_stream_handler, respect_handler_level=True)
 logging.basicConfig(
     level=logging.INFO,
-    format='%(asctime)s - %(levelname)s - %(message)s',
-    datefmt='%Y-%m-%d %H:%M:%S',
-    stream=sys.stdout
+    # Only the message is rendered when enqueuing, the listener handler adds the timestamp and level
+    format='%(message)s',
+    handlers=[logging.handlers.QueueHandler(log_queue)]
 )
+log_listener.start()
+atexit.register(log_listener.stop)
 
 mcp_server = FastMCP()
 
+# Methods allowed when a CRD or group lists none, or nothing is configured
+ALL_METHODS = ('docs', 'list', 'get', 'create', 'update')
+
+# Concurrent reads when fetching an explicit CRD allowlist by name
+CRD_FETCH_WORKERS = 8
+# CRDs per list request when the whole catalog is needed
+CRD_LIST_PAGE_SIZE = 500
+# Seconds before a CRD request is abandoned, so startup fails instead of hanging
+CRD_REQUEST_TIMEOUT = 30
+
 @mcp_server.resource("docs://cluster-provision-instructions")
 def prompt_cluster_provision_instructions():
     """
@@ -35,6 +64,16 @@ def prompt_cluster_provision_instructions():
     """
 
 
+def methods_or_all(kind: str, name: str, methods: Optional[List[str]]) -> List[str]:
+    """
+    Returns the configured methods, or all methods if the list is empty.
+    """
+    if not methods:
+        logging.info("Empty methods list for %s %s - allowing all methods", kind, name)
+        return list(ALL_METHODS)
+    return methods
+
+
 def load_config_from_yaml(config_file: str) -> tuple[Dict[str, List[str]], Dict[str, List[str]]]:
     """
     Load allowed CRDs and groups configuration from YAML file.
@@ -47,58 +86,42 @@ def load_config_from_yaml(config_file: str) -> tuple[Dict[str, List[str]], Dict[
         Empty dictionaries mean allow all CRDs/groups with all methods.
     """
     try:
-        with open(config_file, 'r') as f:
-            config = yaml.safe_load(f)
+        # libyaml reads the raw bytes, skipping Python-side decoding
+        with open(config_file, 'rb') as f:
+            config = yaml.load(f, Loader=YamlSafeLoader)
         
         # Handle empty file or None content
         if not config:
-            logging.info(f"Empty configuration file {config_file} - allowing all CRDs with all methods")
+            logging.info("Empty configuration file %s - allowing all CRDs with all methods", config_file)
             return {}, {}
         
-        # Process allowed_crds
-        allowed_crds = {}
         crd_list = config.get('allowed_crds', [])
-        
-        for crd_config in crd_list:
-            crd_name = crd_config.get('name')
-            methods = crd_config.get('methods', [])
-            if crd_name:
-                # Empty methods list means allow all methods for this CRD
-                if not methods:
-                    logging.info(f"Empty methods list for CRD {crd_name} - allowing all methods")
-                    methods = ['docs', 'list', 'get', 'create', 'update']
-                allowed_crds[crd_name] = methods
-        
-        # Process allowed_groups
-        allowed_groups = {}
         group_list = config.get('allowed_groups', [])
-        
-        for group_config in group_list:
-            group_name = group_config.get('name')
-            methods = group_config.get('methods', [])
-            if group_name:
-                # Empty methods list means allow all methods for this group
-                if not methods:
-                    logging.info(f"Empty methods list for group {group_name} - allowing all methods")
-                    methods = ['docs', 'list', 'get', 'create', 'update']
-                allowed_groups[group_name] = methods
+        allowed_crds = {
+            crd_config['name']: methods_or_all('CRD', crd_config['name'], crd_config.get('methods'))
+            for crd_config in crd_list if crd_config.get('name')
+        }
+        allowed_groups = {
+            group_config['name']: methods_or_all('group', group_config['name'], group_config.get('methods'))
+            for group_config in group_list if group_config.get('name')
+        }
         
         # Handle case where both lists are empty
         if not crd_list and not group_list:
-            logging.info(f"Empty allowed_crds and allowed_groups lists in {config_file} - allowing all CRDs with all methods")
+            logging.info("Empty allowed_crds and allowed_groups lists in %s - allowing all CRDs with all methods", config_file)
             return {}, {}
                 
-        logging.info(f"Loaded configuration: {len(allowed_crds)} CRDs, {len(allowed_groups)} groups from {config_file}")
+        logging.info("Loaded configuration: %s CRDs, %s groups from %s", len(allowed_crds), len(allowed_groups), config_file)
         return allowed_crds, allowed_groups
         
     except FileNotFoundError:
-        logging.error(f"Configuration file {config_file} not found")
+        logging.error("Configuration file %s not found", config_file)
         sys.exit(1)
     except yaml.YAMLError as e:
-        logging.error(f"Error parsing YAML file {config_file}: {e}")
+        logging.error("Error parsing YAML file %s: %s", config_file, e)
         sys.exit(1)
     except Exception as e:
-        logging.error(f"Error loading configuration: {e}")
+        logging.error("Error loading configuration: %s", e)
         sys.exit(1)
 
 
@@ -118,34 +141,77 @@ def get_default_config() -> tuple[Dict[str, List[str]], Dict[str, List[str]]]:
     return allowed_crds, allowed_groups
 
 
-def get_effective_methods(crd_name: str, crd_group: str, allowed_crds: Dict[str, List[str]], allowed_groups: Dict[str, List[str]]) -> List[str]:
+# Tool registration function of each configurable method
+_TOOL_DISPATCH = {
+    "docs": add_doc,
+    "list": add_list_tool,
+    "get": add_get_tool,
+    "create": add_create_tool,
+    "update": add_update_tool,
+}
+
+
+def add_crd_tools(mcp: FastMCP, crd_info: CRDInfo, allowed_methods: List[str]):
     """
-    Get the effective methods for a CRD based on individual CRD config and group config.
-    Individual CRD configuration takes precedence over group configuration.
-    
+    Adds the tools of the allowed methods for one CRD.
+    Registration only builds schemas and closures, the Kubernetes API is first
+    called when a tool runs.
+
     Args:
-        crd_name: Name of the CRD
-        crd_group: Group of the CRD
-        allowed_crds: Dictionary of allowed CRDs and their methods
-        allowed_groups: Dictionary of allowed groups and their methods
-        
+        mcp: FastMCP server instance
+        crd_info: The CRD to add tools for
+        allowed_methods: The methods to add tools for
+    """
+    for method in allowed_methods:
+        add_tool = _TOOL_DISPATCH.get(method)
+        if add_tool is None:
+            logging.warning("Unknown method %s for %s, skipping", method, crd_info.name)
+            continue
+        logging.info("Adding %s tool for %s", method, crd_info.name)
+        add_tool(mcp, crd_info)
+
+
+def fetch_crds(allowed_crds: Dict[str, List[str]], allowed_groups: Dict[str, List[str]]) -> List:
+    """
+    Fetches the CRDs the configuration may allow.
+    An explicit CRD allowlist is read by name, in parallel, instead of listing
+    every CRD in the cluster to keep a handful of them. Group rules and the
+    allow-all configuration need the full list.
+
+    Args:
+        allowed_crds: Dictionary mapping CRD names to allowed methods
+        allowed_groups: Dictionary mapping group names to allowed methods
+
     Returns:
-        List of allowed methods for this CRD, or empty list if not allowed
+        List of Custom Resource Definition objects
     """
-    # Check if CRD is explicitly configured (takes precedence)
-    if crd_name in allowed_crds:
-        return allowed_crds[crd_name]
-    
-    # Check if group is configured
-    if crd_group in allowed_groups:
-        return allowed_groups[crd_group]
-    
-    # If both allowed_crds and allowed_groups are empty, allow all
-    if len(allowed_crds) == 0 and len(allowed_groups) == 0:
-        return ['docs', 'list', 'get', 'create', 'update']
-    
-    # Not explicitly allowed
-    return []
+    extensions_v1 = get_kube_extensionsv1_client()
+    if allowed_groups or not allowed_crds:
+        # CRDs carry their full schemas, page the list so no single response holds the whole catalog
+        crds = []
+        continue_token = None
+        while True:
+            crd_list = extensions_v1.list_custom_resource_definition(
+                limit=CRD_LIST_PAGE_SIZE,
+                _continue=continue_token,
+                _request_timeout=CRD_REQUEST_TIMEOUT
+            )
+            crds.extend(crd_list.items)
+            continue_token = crd_list.metadata._continue
+            if not continue_token:
+                return crds
+
+    def read_crd(name: str):
+        try:
+            return extensions_v1.read_custom_resource_definition(name=name, _request_timeout=CRD_REQUEST_TIMEOUT)
+        except ApiException as e:
+            if e.status != 404:
+                raise
+            logging.warning("CRD %s is configured but not installed in the cluster, skipping", name)
+            return None
+
+    with ThreadPoolExecutor(max_workers=min(len(allowed_crds), CRD_FETCH_WORKERS)) as executor:
+        return [crd for crd in executor.map(read_crd, allowed_crds) if crd is not None]
 
 
 def add_k8s_resources(mcp: FastMCP, allowed_crds: Dict[str, List[str]], allowed_groups: Optional[Dict[str, List[str]]] = None):
@@ -160,39 +226,25 @@ def add_k8s_resources(mcp: FastMCP, allowed_crds: Dict[str, List[str]], allowed_
     if allowed_groups is None:
         allowed_groups = {}
         
-    extensions_v1 = get_kube_extensionsv1_client()
+    # If both allowed_crds and allowed_groups are empty, allow all
+    default_methods = ALL_METHODS if not allowed_crds and not allowed_groups else ()
 
-    logging.info(f"Adding CRDs from extensions_v1")
-    crd_list = extensions_v1.list_custom_resource_definition()
-    for crd in crd_list.items:
-        logging.info(f"Adding CRD {crd.metadata.name} (group: {crd.spec.group})")
+    logging.info("Adding CRDs from extensions_v1")
+    for crd in fetch_crds(allowed_crds, allowed_groups):
         crd_name = crd.metadata.name
         crd_group = crd.spec.group
+        logging.info("Adding CRD %s (group: %s)", crd_name, crd_group)
         
-        # Get effective methods for this CRD
-        allowed_methods = get_effective_methods(crd_name, crd_group, allowed_crds, allowed_groups)
+        # Individual CRD configuration takes precedence over group configuration
+        allowed_methods = allowed_crds.get(crd_name) or allowed_groups.get(crd_group) or default_methods
         
         # Skip if no methods are allowed
         if not allowed_methods:
             continue
             
-        logging.info(f"Adding CRD {crd_name} (group: {crd_group}) with methods: {allowed_methods}")
+        logging.info("Adding CRD %s (group: %s) with methods: %s", crd_name, crd_group, allowed_methods)
         
-        if "docs" in allowed_methods:
-            logging.info(f"Adding docs tool for {crd_name}")
-            add_doc(mcp, crd)
-        if "list" in allowed_methods:
-            logging.info(f"Adding list tool for {crd_name}")
-            add_list_tool(mcp, crd)
-        if "get" in allowed_methods:
-            logging.info(f"Adding get tool for {crd_name}")
-            add_get_tool(mcp, crd)
-        if "create" in allowed_methods:
-            logging.info(f"Adding create tool for {crd_name}")
-            add_create_tool(mcp, crd)
-        if "update" in allowed_methods:
-            logging.info(f"Adding update tool for {crd_name}")
-            add_update_tool(mcp, crd)
+        add_crd_tools(mcp, get_crd_info(crd), allowed_methods)
 
 
 def main():
@@ -214,6 +266,18 @@ def main():
         default=8000,
         help='Port to bind the server to (default: 8000)'
     )
+    parser.add_argument(
+        '--cache-resync-period',
+        type=int,
+        default=600,
+        help='Seconds between full relists of the in-memory resource cache (default: 600)'
+    )
+    parser.add_argument(
+        '--kube-connection-pool-size',
+        type=int,
+        default=32,
+        help='Connections kept open to the Kubernetes API server for tool calls, also the number of tool calls run concurrently; resource cache watches use connections of their own (default: 32)'
+    )
     
     args = parser.parse_args()
     
@@ -226,10 +290,13 @@ def main():
         logging.info("No configuration file provided, using default configuration")
         allowed_crds, allowed_groups = get_default_config()
     
+    configure_connection_pool(args.kube_connection_pool_size)
+    configure_informers(args.cache_resync_period)
+
     # Add the K8s resources
     add_k8s_resources(mcp_server, allowed_crds, allowed_groups)
     
-    logging.info(f"Starting MCP server on {args.host}:{args.port}...")
+    logging.info("Starting MCP server on %s:%s...", args.host, args.port)
     mcp_server.run(transport="sse", host=args.host, port=args.port)
 
 